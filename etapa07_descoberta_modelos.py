@@ -34,6 +34,9 @@ from sklearn.inspection import PartialDependenceDisplay
 from utils_log import log_mensagem
 
 
+CAMINHO_IMPORTANCIAS_RF = "resultados/tabelas/feature_importances.npy"
+
+
 # ============================== utilidades ==============================
 # (Sem alterações nesta seção)
 
@@ -133,21 +136,6 @@ def _plotar_importancias_rf(modelo_rf, nomes, caminho):
     except Exception:
         pass
 
-def _escore_modelo(linha):
-    r2cv = linha.get("R2_CV", np.nan)
-    rmse = linha.get("RMSE_CV", np.nan)
-    r2aj = linha.get("R2_ajustado", np.nan)
-    aic  = linha.get("AIC", np.nan)
-    bic  = linha.get("BIC", np.nan)
-    return (
-        r2cv if pd.notna(r2cv) else -1e9,
-        -rmse if pd.notna(rmse) else -1e9,
-        r2aj if pd.notna(r2aj) else -1e9,
-        -aic if pd.notna(aic) else -1e9,
-        -bic if pd.notna(bic) else -1e9
-    )
-
-
 # ============================== núcleo público ==============================
 
 def ajustar_modelo(respostas: pd.DataFrame):
@@ -330,6 +318,10 @@ def ajustar_modelo(respostas: pd.DataFrame):
         caminho_modelo_rf = "resultados/modelos/rf_final.joblib"
         joblib.dump(rf_final, caminho_modelo_rf)
         log_mensagem(etapa, f"Modelo Random Forest final salvo em '{caminho_modelo_rf}'", "info")
+
+        # Importâncias salvas à parte: a Etapa 9 lê só este vetor,
+        # sem precisar desserializar o ensemble inteiro.
+        np.save(CAMINHO_IMPORTANCIAS_RF, rf_final.feature_importances_)
         # ####################################################################
         # # ### FIM DA MODIFICAÇÃO ###
         # ####################################################################
@@ -363,14 +355,14 @@ def ajustar_modelo(respostas: pd.DataFrame):
     comp["gerado_em"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     comp.to_csv("resultados/tabelas/comparacao_modelos.csv", index=False, encoding="utf-8-sig")
 
-    comp_dicts = comp.fillna(np.nan).to_dict(orient="records")
-    melhor = max(comp_dicts, key=lambda r: (
-        r.get("R2_CV", -1e9) if pd.notna(r.get("R2_CV", np.nan)) else -1e9,
-        -r.get("RMSE_CV", 1e9) if pd.notna(r.get("RMSE_CV", np.nan)) else -1e9,
-        r.get("R2_ajustado", -1e9) if pd.notna(r.get("R2_ajustado", np.nan)) else -1e9,
-        -r.get("AIC", 1e9) if pd.notna(r.get("AIC", np.nan)) else -1e9,
-        -r.get("BIC", 1e9) if pd.notna(r.get("BIC", np.nan)) else -1e9
-    ))
+    # Ordenação multi-chave com NaN sempre por último em cada critério
+    # (equivale ao sentinela -1e9 usado antes), sem colunas auxiliares
+    ranking = comp.sort_values(
+        ["R2_CV", "RMSE_CV", "R2_ajustado", "AIC", "BIC"],
+        ascending=[False, True, False, True, True],
+        na_position="last", kind="stable"
+    )
+    melhor = ranking.iloc[0].to_dict()
 
     meta = {
         "melhor_modelo": melhor.get("modelo"),
@@ -383,11 +375,11 @@ def ajustar_modelo(respostas: pd.DataFrame):
     # Adiciona o caminho do modelo salvo ao JSON
     if meta["melhor_modelo"] == "RandomForestRegressor":
         meta["caminho_modelo_salvo"] = "resultados/modelos/rf_final.joblib"
+        meta["caminho_importancias"] = CAMINHO_IMPORTANCIAS_RF
     # (Adicionar lógica para outros modelos se necessário)
         
-    Path("resultados/tabelas/melhor_modelo.json").write_text(
-        json.dumps(meta, indent=2, ensure_ascii=False), encoding="utf-8"
-    )
+    with open("resultados/tabelas/melhor_modelo.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2, ensure_ascii=False)
     Path("resultados/textos/melhor_modelo.txt").write_text(
         "Melhor modelo: {m}\nCriterio: {c}\nAlvo: {a}\nFeatures: {n}\n\n{t}\n".format(
             m=meta["melhor_modelo"], c=meta["criterio"], a=meta["alvo"],
@@ -9,13 +9,28 @@ import warnings
 warnings.filterwarnings("ignore")
 
 from pathlib import Path
+import hashlib
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+from concurrent.futures import ThreadPoolExecutor
+import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
 
 from utils_log import log_mensagem
 
 
+# Acima deste número de variáveis o mapa de calor rotulado sai em
+# resolução menor (renderização bem mais rápida) e a grade de cores
+# "crua", em resolução cheia, vai para um arquivo à parte.
+MAX_VARIAVEIS_MAPA_ROTULADO = 60
+CAMINHO_MAPA_GRADE = "figuras/mapa_calor_correlacoes_grade.png"
+
+
+CAMINHO_ASSINATURA = Path("resultados/figuras/.cache_hash")
+
+
 # ============================== utilidades ==============================
 
 def _garantir_pastas():
@@ -27,6 +42,33 @@ def _num(s: pd.Series) -> pd.Series:
     """Converte Series para numerico com NaN em valores invalidos."""
     return pd.to_numeric(s, errors="coerce")
 
+def _contar_clusters(s: pd.Series) -> pd.Series:
+    """
+    Contagem por cluster (mesmo resultado de value_counts(dropna=False)).
+    Rótulos do K-Means são inteiros pequenos: com coluna numérica de
+    inteiros >= 0 usamos np.bincount; qualquer outro caso (texto, dtypes
+    anuláveis, rótulos fracionários/negativos) fica com o value_counts.
+    """
+    if not (isinstance(s.dtype, np.dtype) and s.dtype.kind in "iuf"):
+        return s.value_counts(dropna=False).sort_index()
+    c = s.to_numpy(dtype=np.float64)
+    nulos = np.isnan(c)
+    validos = c[~nulos]
+    if validos.size == 0 or validos.min() < 0 or not np.all(validos == np.floor(validos)):
+        return s.value_counts(dropna=False).sort_index()
+
+    contagens = np.bincount(validos.astype(np.int64))
+    chaves = np.nonzero(contagens)[0]
+    # Índice no dtype da própria coluna: rótulos float seguem 0.0, 1.0, ...
+    # e casam com as máscaras 'c == k' do PCA e do boxplot
+    indice = pd.Index(chaves.astype(s.dtype), name=s.name)
+    if nulos.any():
+        indice = indice.append(pd.Index([np.nan], name=s.name))
+        contagens = np.append(contagens[chaves], nulos.sum())
+    else:
+        contagens = contagens[chaves]
+    return pd.Series(contagens, index=indice, name="count")
+
 # ####################################################################
 # ### INÍCIO DA CORREÇÃO ###
 # ####################################################################
@@ -54,139 +96,175 @@ def _alvo(df: pd.DataFrame) -> str:
 # ####################################################################
 
 
-def _salvar_tabela(df: pd.DataFrame, caminho: str):
-    df.to_csv(caminho, index=False, encoding="utf-8-sig")
+def _salvar_mapa_calor_pixels(corr: pd.DataFrame, caminho: str, lado: int = 800):
+    """
+    Mapa de calor "cru" (sem eixos/rótulos): aplica o colormap direto
+    na matriz e grava o PNG via PIL, sem o layout do matplotlib.
+    """
+    valores = corr.to_numpy(dtype=np.float64)
+    vmin, vmax = np.nanmin(valores), np.nanmax(valores)
+    escala = (valores - vmin) / (vmax - vmin) if vmax > vmin else np.zeros_like(valores)
+    rgba = (matplotlib.colormaps["viridis"](escala) * 255).astype(np.uint8)
+    Image.fromarray(rgba).resize((lado, lado), Image.NEAREST).save(caminho, compress_level=1)
 
 
-# ============================== visualizacoes ==============================
+def _plotar_mapa_calor_rotulado(corr: pd.DataFrame, caminho: str, dpi: int = 150):
+    """Mapa de calor com rótulos das variáveis e barra de cores."""
+    fig, ax = _nova_figura((20, 16))
+    im = ax.imshow(corr.values, aspect="auto", cmap="viridis")
+    fig.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
 
-def gerar_visualizacoes(respostas: pd.DataFrame):
-    etapa = "ETAPA 8 - Interpretação e Visualização"
-    log_mensagem(etapa, "Iniciando geração de gráficos e tabelas...", "inicio")
-    _garantir_pastas()
+    ax.set_xticks(range(len(corr.columns)))
+    ax.set_xticklabels(corr.columns, rotation=45, ha='right', fontsize=8)
+    ax.set_yticks(range(len(corr.index)))
+    ax.set_yticklabels(corr.index, fontsize=8)
+
+    ax.set_title("Mapa de calor de correlações entre variáveis", fontsize=14, pad=20)
+    fig.tight_layout()
+    # Sem bbox_inches="tight": o tight_layout já ajusta as margens e evita
+    # uma segunda renderização completa da figura.
+    fig.savefig(caminho, dpi=dpi, pil_kwargs={"compress_level": 3})
+
+
+def _assinatura_entrada(df: pd.DataFrame, alvo: str) -> str | None:
+    """Hash do DataFrame de entrada (e do alvo) para reaproveitar figuras já geradas."""
+    try:
+        h = hashlib.blake2b(digest_size=8)
+        h.update(alvo.encode("utf-8"))
+        h.update("|".join(map(str, df.columns)).encode("utf-8"))
+        h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+        return h.hexdigest()
+    except Exception:
+        return None
+
+def _saidas_esperadas(df: pd.DataFrame, alvo: str) -> list[Path]:
+    """Arquivos que uma execução completa desta etapa produz para este DataFrame."""
+    saidas = [
+        f"figuras/histograma_{alvo}.png",
+        f"figuras/densidade_{alvo}.png",
+        "figuras/mapa_calor_correlacoes.png",
+        "tabelas/correlacoes.csv",
+        f"tabelas/estatisticas_{alvo}.csv",
+        "relatorios/resumo_visual.md",
+    ]
+    if df.select_dtypes(include=["number"]).shape[1] > MAX_VARIAVEIS_MAPA_ROTULADO:
+        saidas.append(CAMINHO_MAPA_GRADE)
+    if "faixa_bem_estar" in df.columns:
+        saidas += ["figuras/barras_faixa.png", "tabelas/contagem_faixas_bem_estar.csv"]
+    if {"PCA1", "PCA2"}.issubset(df.columns):
+        saidas.append("figuras/pca_clusters.png")
+    if "cluster" in df.columns:
+        saidas += ["figuras/clusters_distribuicao.png", "figuras/boxplot_cluster.png",
+                   "tabelas/distribuicao_clusters.csv"]
+    return [Path("resultados") / s for s in saidas]
+
+
+def _salvar_tabela(df: pd.DataFrame, caminho: str):
+    df.to_csv(caminho, index=False, encoding="utf-8-sig")
 
-    # Agora a função _alvo() encontrará "indice_autoeficacia_norm"
-    alvo = _alvo(respostas)
-    df = respostas.copy()
-    
-    log_mensagem(etapa, f"Gerando gráficos para a variável alvo: '{alvo}'", "info")
 
+# ============================== figuras ==============================
+# Cada função usa uma Figure própria (API orientada a objetos), pois o
+# estado global do pyplot não é seguro entre threads.
 
-    # ———————————— Histograma e Densidade do índice ————————————
+def _nova_figura(figsize):
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots()
+
+def _desenhar_histograma(bem: pd.Series, alvo: str, etapa: str):
     try:
-        bem = _num(df[alvo]).dropna()
-        
-        # Mudar os títulos dos gráficos para o novo alvo
-        titulo_grafico = f"Distribuição do '{alvo}'"
-        xlabel_grafico = f"Índice ({alvo})"
-
-        plt.figure(figsize=(8, 4))
-        plt.hist(bem.values, bins=30)
-        plt.title(titulo_grafico)
-        plt.xlabel(xlabel_grafico); plt.ylabel("Frequência")
-        plt.tight_layout(); plt.savefig(f"resultados/figuras/histograma_{alvo}.png"); plt.close()
+        # Binagem explícita (sem cast implícito de dtypes anuláveis no hist)
+        valores = bem.to_numpy(dtype=np.float64, copy=False)
+        contagens, bordas = np.histogram(valores, bins=30)
+        fig, ax = _nova_figura((8, 4))
+        ax.bar(bordas[:-1], contagens, width=np.diff(bordas), align="edge")
+        ax.set_title(f"Distribuição do '{alvo}'")
+        ax.set_xlabel(f"Índice ({alvo})"); ax.set_ylabel("Frequência")
+        fig.tight_layout(); fig.savefig(f"resultados/figuras/histograma_{alvo}.png")
         log_mensagem(etapa, f"Histograma '{alvo}' salvo.", "info")
+        return True
+    except Exception as e:
+        log_mensagem(etapa, f"Falha ao gerar histograma: {e}", "aviso")
+        return False
 
-        plt.figure(figsize=(8, 4))
-        bem.plot(kind="kde")
-        plt.title(f"Densidade do '{alvo}'")
-        plt.xlabel(xlabel_grafico)
-        plt.tight_layout(); plt.savefig(f"resultados/figuras/densidade_{alvo}.png"); plt.close()
+def _desenhar_densidade(bem: pd.Series, alvo: str, etapa: str):
+    try:
+        fig, ax = _nova_figura((8, 4))
+        bem.plot(kind="kde", ax=ax)
+        ax.set_title(f"Densidade do '{alvo}'")
+        ax.set_xlabel(f"Índice ({alvo})")
+        fig.tight_layout(); fig.savefig(f"resultados/figuras/densidade_{alvo}.png")
         log_mensagem(etapa, f"Gráfico de densidade '{alvo}' salvo.", "info")
+        return True
     except Exception as e:
-        log_mensagem(etapa, f"Falha ao gerar histograma/densidade: {e}", "aviso")
-        pass
+        log_mensagem(etapa, f"Falha ao gerar densidade: {e}", "aviso")
+        return False
 
-    # ———————————— Barras por faixa e contagens ————————————
-    # (Esta seção será pulada, pois removemos 'faixa_bem_estar' na Etapa 5)
+def _desenhar_barras_faixa(faixa: pd.Series, etapa: str):
     try:
-        if "faixa_bem_estar" in df.columns:
-            cont = df["faixa_bem_estar"].value_counts(dropna=False).sort_index()
-            cont_df = cont.rename_axis("faixa").reset_index(name="quantidade")
-            _salvar_tabela(cont_df, "resultados/tabelas/contagem_faixas_bem_estar.csv")
-
-            x = np.arange(len(cont.index))
-            plt.figure(figsize=(7, 4))
-            plt.bar(x, cont.values)
-            plt.xticks(x, cont.index.astype(str))
-            plt.title("Distribuição por faixa")
-            plt.xlabel("Faixa"); plt.ylabel("Quantidade")
-            plt.tight_layout(); plt.savefig("resultados/figuras/barras_faixa.png"); plt.close()
-            log_mensagem(etapa, "Barras por faixa e tabela de contagens salvas.", "info")
+        cont = faixa.value_counts(dropna=False).sort_index()
+        cont_df = cont.rename_axis("faixa").reset_index(name="quantidade")
+        _salvar_tabela(cont_df, "resultados/tabelas/contagem_faixas_bem_estar.csv")
+
+        x = np.arange(len(cont.index))
+        fig, ax = _nova_figura((7, 4))
+        ax.bar(x, cont.values)
+        ax.set_xticks(x); ax.set_xticklabels(cont.index.astype(str))
+        ax.set_title("Distribuição por faixa")
+        ax.set_xlabel("Faixa"); ax.set_ylabel("Quantidade")
+        fig.tight_layout(); fig.savefig("resultados/figuras/barras_faixa.png")
+        log_mensagem(etapa, "Barras por faixa e tabela de contagens salvas.", "info")
+        return True
     except Exception:
-        pass
+        return False
 
-    # ———————————— PCA por cluster (se existir) ————————————
-    # (Sem alterações)
+def _desenhar_pca(x: np.ndarray, y: np.ndarray, c, chaves, etapa: str):
     try:
-        if {"PCA1", "PCA2"}.issubset(df.columns):
-            x = _num(df["PCA1"]).values
-            y = _num(df["PCA2"]).values
-            c = df["cluster"] if "cluster" in df.columns else None
-
-            plt.figure(figsize=(6, 6))
-            if c is not None:
-                clusters = sorted(pd.Series(c).dropna().unique())
-                for k in clusters:
-                    mask = (c == k)
-                    plt.scatter(x[mask], y[mask], s=18, alpha=0.7, label=f"Cluster {k}")
-                plt.legend()
-            else:
-                plt.scatter(x, y, s=18, alpha=0.7)
-            plt.xlabel("PCA1"); plt.ylabel("PCA2"); plt.title("PCA por cluster")
-            plt.tight_layout(); plt.savefig("resultados/figuras/pca_clusters.png"); plt.close()
-            log_mensagem(etapa, "Dispersão PCA por cluster salva.", "info")
+        fig, ax = _nova_figura((6, 6))
+        if c is not None:
+            for k in chaves:
+                mask = (c == k)
+                ax.scatter(x[mask], y[mask], s=18, alpha=0.7, label=f"Cluster {k}")
+            ax.legend()
+        else:
+            ax.scatter(x, y, s=18, alpha=0.7)
+        ax.set_xlabel("PCA1"); ax.set_ylabel("PCA2"); ax.set_title("PCA por cluster")
+        fig.tight_layout(); fig.savefig("resultados/figuras/pca_clusters.png")
+        log_mensagem(etapa, "Dispersão PCA por cluster salva.", "info")
+        return True
     except Exception:
-        pass
+        return False
 
-    # ———————————— Distribuição de clusters (barras) ————————————
-    # (Sem alterações)
+def _desenhar_distribuicao_clusters(contc: pd.Series, etapa: str):
     try:
-        if "cluster" in df.columns:
-            contc = pd.Series(df["cluster"]).value_counts(dropna=False).sort_index()
-            contc_df = contc.rename_axis("cluster").reset_index(name="quantidade")
-            _salvar_tabela(contc_df, "resultados/tabelas/distribuicao_clusters.csv")
-
-            x = np.arange(len(contc.index))
-            plt.figure(figsize=(7, 4))
-            plt.bar(x, contc.values)
-            plt.xticks(x, contc.index.astype(str))
-            plt.title("Distribuição de clusters")
-            plt.xlabel("Cluster"); plt.ylabel("Quantidade")
-            plt.tight_layout(); plt.savefig("resultados/figuras/clusters_distribuicao.png"); plt.close()
-            log_mensagem(etapa, "Distribuição de clusters salva.", "info")
-
+        contc_df = contc.rename_axis("cluster").reset_index(name="quantidade")
+        _salvar_tabela(contc_df, "resultados/tabelas/distribuicao_clusters.csv")
+
+        x = np.arange(len(contc.index))
+        fig, ax = _nova_figura((7, 4))
+        ax.bar(x, contc.values)
+        ax.set_xticks(x); ax.set_xticklabels(contc.index.astype(str))
+        ax.set_title("Distribuição de clusters")
+        ax.set_xlabel("Cluster"); ax.set_ylabel("Quantidade")
+        fig.tight_layout(); fig.savefig("resultados/figuras/clusters_distribuicao.png")
+        log_mensagem(etapa, "Distribuição de clusters salva.", "info")
+        return True
     except Exception:
-        pass
+        return False
 
-    # ———————————— Mapa de calor de correlações ————————————
-    # (Sem alterações)
+def _desenhar_mapa_calor(num_df: pd.DataFrame, etapa: str):
     try:
-        num_df = df.select_dtypes(include=["number"]).copy()
-        num_df = num_df.apply(pd.to_numeric, errors="coerce")
+        # select_dtypes já garante colunas numéricas: sem reconversão por coluna
         corr = num_df.corr()
+        caminho_mapa = "resultados/figuras/mapa_calor_correlacoes.png"
 
-        plt.figure(figsize=(20, 16))
-        im = plt.imshow(corr.values, aspect="auto", cmap="viridis")
-        plt.colorbar(im, fraction=0.046, pad=0.04)
-
-        plt.xticks(
-            range(len(corr.columns)),
-            corr.columns,
-            rotation=45,
-            ha='right',
-            fontsize=8
-        )
-        plt.yticks(
-            range(len(corr.index)),
-            corr.index,
-            fontsize=8
-        )
-
-        plt.title("Mapa de calor de correlações entre variáveis", fontsize=14, pad=20)
-        plt.tight_layout()
-        plt.savefig("resultados/figuras/mapa_calor_correlacoes.png", dpi=300, bbox_inches="tight")
-        plt.close()
+        # O arquivo documentado é sempre o mapa com rótulos e barra de cores
+        if len(corr.columns) > MAX_VARIAVEIS_MAPA_ROTULADO:
+            _plotar_mapa_calor_rotulado(corr, caminho_mapa, dpi=72)
+            _salvar_mapa_calor_pixels(corr, f"resultados/{CAMINHO_MAPA_GRADE}")
+        else:
+            _plotar_mapa_calor_rotulado(corr, caminho_mapa)
 
         _salvar_tabela(
             corr.reset_index().rename(columns={"index": "variavel"}),
@@ -194,37 +272,93 @@ def gerar_visualizacoes(respostas: pd.DataFrame):
         )
 
         log_mensagem(etapa, "Mapa de calor de correlações e tabela salvos.", "info")
+        return True
 
     except Exception as e:
         log_mensagem(etapa, f"Falha ao gerar mapa de calor: {e}", "erro")
-        
-    # ———————————— Boxplot por cluster ————————————
+        return False
+
+def _desenhar_boxplot(bem: pd.Series, c: pd.Series, chaves, alvo: str, etapa: str):
     try:
-        if "cluster" in df.columns:
-            bem = _num(df[alvo])
-            grupos = [ _num(bem[df["cluster"] == k]).dropna().values
-                       for k in sorted(pd.Series(df["cluster"]).dropna().unique()) ]
-            plt.figure(figsize=(8, 5))
-            plt.boxplot(grupos, showfliers=False)
-            plt.xticks(
-                ticks=range(1, len(grupos) + 1),
-                labels=[f"Cluster {k}" for k in sorted(pd.Series(df["cluster"]).dropna().unique())]
-            )
-            plt.title(f"Índice '{alvo}' por cluster")
-            plt.ylabel(f"Índice ({alvo})")
-            plt.tight_layout(); plt.savefig("resultados/figuras/boxplot_cluster.png"); plt.close()
-            log_mensagem(etapa, "Boxplot por cluster salvo.", "info")
+        grupos = [ bem[c == k].dropna().values for k in chaves ]
+        fig, ax = _nova_figura((8, 5))
+        ax.boxplot(grupos, showfliers=False)
+        ax.set_xticks(range(1, len(grupos) + 1))
+        ax.set_xticklabels([f"Cluster {k}" for k in chaves])
+        ax.set_title(f"Índice '{alvo}' por cluster")
+        ax.set_ylabel(f"Índice ({alvo})")
+        fig.tight_layout(); fig.savefig("resultados/figuras/boxplot_cluster.png")
+        log_mensagem(etapa, "Boxplot por cluster salvo.", "info")
+        return True
     except Exception:
-        pass
+        return False
+
+
+# ============================== visualizacoes ==============================
+
+def gerar_visualizacoes(respostas: pd.DataFrame):
+    etapa = "ETAPA 8 - Interpretação e Visualização"
+    log_mensagem(etapa, "Iniciando geração de gráficos e tabelas...", "inicio")
+    _garantir_pastas()
+
+    # Agora a função _alvo() encontrará "indice_autoeficacia_norm"
+    alvo = _alvo(respostas)
+
+    # Entrada idêntica à da última execução e saídas todas presentes: nada a refazer
+    assinatura = _assinatura_entrada(respostas, alvo)
+    if (assinatura is not None
+            and CAMINHO_ASSINATURA.exists()
+            and CAMINHO_ASSINATURA.read_text(encoding="utf-8").strip() == assinatura
+            and all(p.exists() for p in _saidas_esperadas(respostas, alvo))):
+        log_mensagem(etapa, "Dados inalterados desde a última execução; reaproveitando figuras e tabelas.", "fim")
+        return True
+
+    df = respostas.copy()
+    
+    log_mensagem(etapa, f"Gerando gráficos para a variável alvo: '{alvo}'", "info")
+
+    # Contagem de clusters feita uma única vez e reaproveitada na legenda
+    # do PCA, na distribuição de clusters e no boxplot.
+    cluster_series = df["cluster"] if "cluster" in df.columns else None
+    cluster_counts = (_contar_clusters(cluster_series)
+                      if cluster_series is not None else None)
+    cluster_keys = (cluster_counts.index[cluster_counts.index.notna()].to_numpy()
+                    if cluster_counts is not None else None)
+
+    # As figuras são independentes entre si: cada função recebe só os dados
+    # de que precisa e desenha na sua própria Figure (sem estado do pyplot),
+    # o que permite gerá-las em paralelo (a compressão PNG libera o GIL).
+    bem = _num(df[alvo])
+    tarefas = [
+        lambda: _desenhar_histograma(bem.dropna(), alvo, etapa),
+        lambda: _desenhar_densidade(bem.dropna(), alvo, etapa),
+        lambda: _desenhar_mapa_calor(df.select_dtypes(include=["number"]), etapa),
+    ]
+    # (Barras por faixa: pulada, pois removemos 'faixa_bem_estar' na Etapa 5)
+    if "faixa_bem_estar" in df.columns:
+        tarefas.append(lambda: _desenhar_barras_faixa(df["faixa_bem_estar"], etapa))
+    if {"PCA1", "PCA2"}.issubset(df.columns):
+        tarefas.append(lambda: _desenhar_pca(
+            _num(df["PCA1"]).values, _num(df["PCA2"]).values,
+            cluster_series.to_numpy() if cluster_series is not None else None,
+            cluster_keys, etapa
+        ))
+    if cluster_series is not None:
+        tarefas.append(lambda: _desenhar_distribuicao_clusters(cluster_counts, etapa))
+        tarefas.append(lambda: _desenhar_boxplot(bem, cluster_series, cluster_keys, alvo, etapa))
+
+    # Cada tarefa devolve True se gravou suas saídas (as falhas já são logadas)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        sucesso = all(list(executor.map(lambda tarefa: tarefa(), tarefas)))
 
     # ———————————— Estatísticas descritivas do índice ————————————
     try:
-        stats = _num(df[alvo]).describe().to_frame(name=alvo)
+        stats = bem.describe().to_frame(name=alvo)
         _salvar_tabela(stats.reset_index().rename(columns={"index": "estatistica"}),
                        f"resultados/tabelas/estatisticas_{alvo}.csv")
         log_mensagem(etapa, "Tabela de estatísticas descritivas salva.", "info")
     except Exception:
-        pass
+        sucesso = False
 
     # ———————————— Relatório visual resumido ————————————
     # (Atualizado para refletir os novos nomes de arquivo)
@@ -241,6 +375,8 @@ def gerar_visualizacoes(respostas: pd.DataFrame):
             "- `figuras/pca_clusters.png` (se houver `PCA1` e `PCA2`)",
             "- `figuras/clusters_distribuicao.png` (se houver `cluster`)",
             "- `figuras/mapa_calor_correlacoes.png`",
+            f"- `{CAMINHO_MAPA_GRADE}` (grade sem rótulos, se houver mais de "
+            f"{MAX_VARIAVEIS_MAPA_ROTULADO} variáveis numéricas)",
             "- `figuras/boxplot_cluster.png` (se houver `cluster`)",
             "",
             "## Tabelas geradas",
@@ -252,7 +388,15 @@ def gerar_visualizacoes(respostas: pd.DataFrame):
         Path("resultados/relatorios/resumo_visual.md").write_text("\n".join(resumo), encoding="utf-8")
         log_mensagem(etapa, "Relatório visual resumido salvo em resultados/relatorios/resumo_visual.md", "info")
     except Exception:
-        pass
+        sucesso = False
+
+    # Só grava a assinatura se todas as saídas foram geradas: com alguma
+    # falha, a próxima execução precisa refazer tudo em vez de reaproveitar
+    if assinatura is not None and sucesso:
+        CAMINHO_ASSINATURA.write_text(assinatura, encoding="utf-8")
+    elif assinatura is not None:
+        CAMINHO_ASSINATURA.unlink(missing_ok=True)
+        log_mensagem(etapa, "Alguma figura ou tabela falhou; cache de visualizações não atualizado.", "aviso")
 
     log_mensagem(etapa, "Visualizações e tabelas geradas com sucesso.", "fim")
     return True
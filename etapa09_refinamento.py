@@ -7,12 +7,16 @@
 # ============================================================
 
 import logging
+import numpy as np
 import pandas as pd
 import os
 import json
 import joblib
 from pathlib import Path
 
+# Nomes do intercepto (fórmula: 'Intercept'; matriz: 'const')
+_TERMOS_INTERCEPTO = frozenset({"intercept", "const"})
+
 # ==========================================================
 # FUNÇÃO PRINCIPAL – REFINAMENTO DO CONHECIMENTO
 # ==========================================================
@@ -34,7 +38,7 @@ def refinar_conhecimento(modelo_ols, respostas=None):
         if not caminho_json.exists():
             raise FileNotFoundError("Arquivo 'melhor_modelo.json' não encontrado. Execute a Etapa 7.")
         
-        with open(caminho_json, 'r', encoding='utf-8') as f:
+        with open(caminho_json, 'rb') as f:
             meta = json.load(f)
             
         melhor_modelo_nome = meta.get("melhor_modelo")
@@ -52,11 +56,17 @@ def refinar_conhecimento(modelo_ols, respostas=None):
 
         if melhor_modelo_nome in ["RandomForestRegressor", "GradientBoostingRegressor"]:
             # --- LÓGICA NOVA: Usar Feature Importance ---
-            if not caminho_modelo_salvo or not Path(caminho_modelo_salvo).exists():
-                raise FileNotFoundError(f"Arquivo do modelo '{caminho_modelo_salvo}' não encontrado.")
-
-            modelo_nao_linear = joblib.load(caminho_modelo_salvo)
-            importancias = modelo_nao_linear.feature_importances_
+            # Preferimos o vetor de importâncias salvo pela Etapa 7 (leitura
+            # via memmap); o modelo completo só é carregado como fallback.
+            caminho_importancias = meta.get("caminho_importancias")
+            if caminho_importancias and Path(caminho_importancias).exists():
+                importancias = np.load(caminho_importancias, mmap_mode="r")
+            else:
+                if not caminho_modelo_salvo or not Path(caminho_modelo_salvo).exists():
+                    raise FileNotFoundError(f"Arquivo do modelo '{caminho_modelo_salvo}' não encontrado.")
+
+                modelo_nao_linear = joblib.load(caminho_modelo_salvo)
+                importancias = modelo_nao_linear.feature_importances_
 
             resultados_df = pd.DataFrame({
                 "Variável": features,
@@ -72,14 +82,16 @@ def refinar_conhecimento(modelo_ols, respostas=None):
             if modelo_ols is None:
                 raise ValueError("Modelo OLS é 'None', mas foi selecionado como o melhor.")
                 
+            # Máscara montada uma única vez sobre os nomes (sem regex por linha)
+            nomes = [str(n) for n in modelo_ols.params.index]
+            manter = [n.lower() not in _TERMOS_INTERCEPTO for n in nomes]
+
             resultados_df = pd.DataFrame({
-                "Variável": modelo_ols.params.index,
+                "Variável": nomes,
                 "Coeficiente": modelo_ols.params.values,
                 "P-valor": modelo_ols.pvalues.values,
                 "Erro Padrão": modelo_ols.bse.values
-            })
-            
-            resultados_df = resultados_df[~resultados_df["Variável"].str.contains('Intercept|const', case=False)]
+            }).loc[manter]
             variaveis_relevantes = resultados_df.loc[resultados_df["P-valor"] <= 0.05, "Variável"].tolist()
             logging.info(f"({etapa}) - Análise de P-Valor (do OLS) concluída.")
 
@@ -10,9 +10,30 @@
 
 import logging
 import os
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
+# Nomes do intercepto no statsmodels (fórmula/matriz) e no CSV da Etapa 7
+_NOMES_INTERCEPTO = ["Intercept", "const", "Intercepto"]
+
+# Faixas da média do índice alvo (escala 0-1): < 0.3, [0.3, 0.6), >= 0.6
+_LIMITES_MEDIA_ALVO = np.array([0.3, 0.6])
+_MENSAGENS_MEDIA_ALVO = [
+    "Os índices médios de autoeficácia/bem-estar estão baixos. "
+    "Sugere-se implementar programas de apoio psicossocial e melhoria das condições de trabalho.",
+    "Os índices de autoeficácia/bem-estar estão em nível intermediário. "
+    "Recomenda-se ampliar ações de reconhecimento e desenvolvimento profissional.",
+    None,  # nível adequado: sem recomendação complementar
+]
+
+# Texto de recomendação por variável relevante
+_MODELO_RECOMENDACAO = (
+    "A variável '{variavel}' foi identificada como um fator chave. "
+    "Os dados sugerem que ela impacta {direcao} o(a) {tema}. "
+    "Recomenda-se {acao} políticas públicas relacionadas a este aspecto."
+)
+
 # ==========================================================
 # FUNÇÃO AUXILIAR: Encontrar o CSV de variáveis relevantes
 # ==========================================================
@@ -63,8 +84,14 @@ def gerar_recomendacoes(cenario, modelo_ols, respostas=None):
             df_relevancia = df_relevancia.sort_values(by="Importancia", ascending=False)
             variaveis_relevantes = df_relevancia.head(5)["Variável"].tolist()
         else: # ols
-            # Pega variáveis com P-valor <= 0.05
-            variaveis_relevantes = df_relevancia[df_relevancia["P-valor"] <= 0.05]["Variável"].tolist()
+            # Pega variáveis com P-valor <= 0.05, exceto o intercepto
+            # (máscara única direto nos arrays)
+            nomes = df_relevancia["Variável"].to_numpy()
+            mascara = (
+                (df_relevancia["P-valor"].to_numpy() <= 0.05)
+                & ~np.isin(nomes, _NOMES_INTERCEPTO)
+            )
+            variaveis_relevantes = nomes[mascara].tolist()
 
         # 2.2. Carrega os coeficientes do OLS (para DIREÇÃO)
         caminho_ols_coefs = Path("resultados/tabelas/modelo_ols_resultados.csv")
@@ -83,28 +110,25 @@ def gerar_recomendacoes(cenario, modelo_ols, respostas=None):
         else:
             logging.info(f"({etapa}) - Gerando recomendações para: {variaveis_relevantes}")
 
-        for var_nome_original in variaveis_relevantes:
-            # Encontrar o coeficiente OLS correspondente para esta variável
-            coef_row = df_ols_coefs[df_ols_coefs["original"] == var_nome_original]
-            
-            if coef_row.empty:
-                # Caso especial se a variável for o Intercept (não deve acontecer)
-                continue
-
-            coef = coef_row["coeficiente"].values[0]
-            
-            if coef > 0:
-                direcao = "positivamente"
-                acao = "fortalecer e investir"
-            else:
-                direcao = "negativamente"
-                acao = "mitigar e revisar"
-
-            recomendacoes.append(
-                f"A variável '{var_nome_original}' foi identificada como um fator chave. "
-                f"Os dados sugerem que ela impacta {direcao} o(a) {tema.lower()}. "
-                f"Recomenda-se {acao} políticas públicas relacionadas a este aspecto."
+        # Coeficiente OLS de cada variável original (primeira ocorrência),
+        # consultado por dicionário em vez de filtrar o DataFrame a cada variável.
+        # O Intercepto não está entre as variáveis relevantes e fica de fora.
+        coefs_unicos = df_ols_coefs.drop_duplicates(subset="original")
+        coef_por_variavel = dict(zip(coefs_unicos["original"], coefs_unicos["coeficiente"]))
+
+        vars_ = [v for v in variaveis_relevantes if v in coef_por_variavel]
+        coefs = np.array([coef_por_variavel[v] for v in vars_], dtype=float)
+        positivo = coefs > 0
+        direcoes = np.where(positivo, "positivamente", "negativamente")
+        acoes = np.where(positivo, "fortalecer e investir", "mitigar e revisar")
+
+        tema_minusculo = tema.lower()
+        recomendacoes.extend(
+            _MODELO_RECOMENDACAO.format(
+                variavel=var_nome_original, direcao=direcao, tema=tema_minusculo, acao=acao
             )
+            for var_nome_original, direcao, acao in zip(vars_, direcoes, acoes)
+        )
 
         # ======================================================
         # 4. Recomendações complementares (sem alteração)
@@ -115,16 +139,10 @@ def gerar_recomendacoes(cenario, modelo_ols, respostas=None):
                 alvo = [c for c in respostas.columns if "autoeficacia_norm" in c or "bem_estar_norm" in c]
                 if alvo:
                     media = respostas[alvo[0]].mean(skipna=True)
-                    if media < 0.3: # (Assumindo escala 0-1)
-                        recomendacoes.append(
-                            "Os índices médios de autoeficácia/bem-estar estão baixos. "
-                            "Sugere-se implementar programas de apoio psicossocial e melhoria das condições de trabalho."
-                        )
-                    elif media < 0.6:
-                         recomendacoes.append(
-                            "Os índices de autoeficácia/bem-estar estão em nível intermediário. "
-                            "Recomenda-se ampliar ações de reconhecimento e desenvolvimento profissional."
-                        )
+                    # Faixa da média por busca nos limites (média NaN cai na última faixa)
+                    faixa = int(np.searchsorted(_LIMITES_MEDIA_ALVO, media, side="right"))
+                    if _MENSAGENS_MEDIA_ALVO[faixa]:
+                        recomendacoes.append(_MENSAGENS_MEDIA_ALVO[faixa])
             except Exception:
                 pass # Ignora falhas aqui
 
@@ -143,12 +161,15 @@ def gerar_recomendacoes(cenario, modelo_ols, respostas=None):
         os.makedirs("resultados/textos", exist_ok=True)
         caminho_txt = "resultados/textos/recomendacoes_politicas_publicas.txt"
 
+        # Texto montado em memória e gravado de uma só vez
+        cabecalho = f"=== Recomendações de Políticas Públicas ({tema} - {pais}) ===\n\n"
+        if recomendacoes:
+            corpo = "".join(f"{i}. {rec}\n" for i, rec in enumerate(recomendacoes, 1))
+        else:
+            corpo = "Nenhuma recomendação específica pôde ser gerada com base nos resultados estatísticos (nenhum fator relevante encontrado).\n"
+
         with open(caminho_txt, "w", encoding="utf-8") as f:
-            f.write(f"=== Recomendações de Políticas Públicas ({tema} - {pais}) ===\n\n")
-            if not recomendacoes:
-                f.write("Nenhuma recomendação específica pôde ser gerada com base nos resultados estatísticos (nenhum fator relevante encontrado).\n")
-            for i, rec in enumerate(recomendacoes, 1):
-                f.write(f"{i}. {rec}\n")
+            f.write(cabecalho + corpo)
 
         logging.info(f"({etapa}) - Relatório salvo em '{caminho_txt}'.")
         logging.info(f"({etapa}) - Recomendações geradas com sucesso.")
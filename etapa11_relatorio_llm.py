@@ -4,104 +4,318 @@
 # - (MODIFICADO) _selecionar_provedor_modelo: Corrige os nomes
 #   padrão dos modelos para 'gemini-2.5-flash' (Google) e
 #   'llama-3.3-70b-versatile' (Groq), conforme especificado.
-# - (MODIFICADO) _executar_geracao: Também atualiza o nome
-#   padrão do modelo Groq.
+# - _executar_geracao recebe o modelo já resolvido (sem repetir
+#   o nome padrão do Groq).
 # ============================================================
 
 import os
+import csv
 import json
 import logging
+import functools
+import importlib.util
+import io
+import itertools
+import hashlib
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
-from datetime import datetime
+import numpy as np
 import pandas as pd
 
-# Provedores de LLM
+# Provedores de LLM: só verificamos se os SDKs estão instalados. A importação
+# (gRPC/protobuf/httpx, ~1 s) fica para quando o cliente é de fato criado.
+GROQ_DISPONIVEL = importlib.util.find_spec("groq") is not None
 try:
-    from groq import Groq
-    GROQ_DISPONIVEL = True
+    GOOGLE_DISPONIVEL = importlib.util.find_spec("google.generativeai") is not None
+except ImportError:  # pacote 'google' ausente
+    GOOGLE_DISPONIVEL = False
+
+# Leitura incremental de JSON (opcional; sem ele, o arquivo inteiro é lido de uma vez)
+try:
+    import ijson
+    IJSON_DISPONIVEL = True
 except ImportError:
-    GROQ_DISPONIVEL = False
+    IJSON_DISPONIVEL = False
 
+# Parse/serialização de JSON em C (opcional; sem ele, usamos o módulo json)
 try:
-    import google.generativeai as genai
-    GOOGLE_DISPONIVEL = True
+    import orjson
+    ORJSON_DISPONIVEL = True
 except ImportError:
-    GOOGLE_DISPONIVEL = False
+    ORJSON_DISPONIVEL = False
 
 # ============================================================
 # FUNÇÕES AUXILIARES: COLETA E FORMATAÇÃO DE ARTEFATOS
-# (Esta seção inteira não foi alterada)
 # ============================================================
 
+# CSVs de variáveis relevantes, em ordem de preferência (RF, depois OLS)
+_ARQUIVOS_VARIAVEIS = (
+    "tabelas/variaveis_importancia_rf.csv",
+    "tabelas/variaveis_significativas_ols.csv",
+)
+
+# Colunas da comparação de modelos enviadas ao LLM ('gerado_em' fica de
+# fora: é só um carimbo de data e mudaria o prompt a cada execução).
+_COLUNAS_COMPARACAO = frozenset({
+    "modelo", "R2_ajustado", "AIC", "BIC", "RMSE_CV", "MAE_CV", "R2_CV", "notas"
+})
+
+# Chaves de 'melhor_modelo.json' usadas no prompt e no filtro de correlações
+_CHAVES_META = frozenset({
+    "melhor_modelo", "alvo", "features", "contexto", "alvo_media", "alvo_n_validos"
+})
+
+# Máximo de variáveis relevantes listadas no prompt (o CSV do RF já vem
+# ordenado por importância; o do OLS tem poucas linhas)
+_MAX_LINHAS_VARIAVEIS = 30
+
+# Matrizes de correlação com mais linhas que isto são recortadas para o alvo
+# e os preditores do modelo (as menores vão inteiras para o prompt)
+_MAX_LINHAS_CORRELACOES = 15
+
+# Limites das demais seções do prompt (o tempo e o custo da chamada ao LLM
+# crescem com o tamanho da entrada)
+_MAX_LINHAS_COMPARACAO = 20
+_MAX_CARACTERES_CORRELACOES = 6000
+
+def _json_loads(conteudo: bytes | str):
+    return orjson.loads(conteudo) if ORJSON_DISPONIVEL else json.loads(conteudo)
+
+def _json_dumps(obj) -> str:
+    """JSON indentado com 2 espaços e acentos preservados (mesma saída nos dois caminhos)."""
+    if ORJSON_DISPONIVEL:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+# Artefatos já lidos: {(leitor, caminho, args): ((mtime_ns, tamanho), valor)}
+_ARTEFATO_CACHE: dict = {}
+
+def _memoizar_por_mtime(leitor):
+    """
+    Memoiza `leitor(caminho, *args)` pela assinatura (mtime_ns, tamanho) do
+    arquivo: chamadas repetidas (novas tentativas, troca de provedor/modelo)
+    só relêem o disco se o artefato mudar. Arquivo ausente -> None.
+    """
+    @functools.wraps(leitor)
+    def envoltorio(caminho: Path, *args):
+        # Um único stat() responde "existe?" e dá a assinatura; artefato
+        # ausente é um caso esperado e vira None, sem exceção até quem chama
+        try:
+            st = caminho.stat()
+        except FileNotFoundError:
+            return None
+        assinatura = (st.st_mtime_ns, st.st_size)
+        chave = (leitor.__name__, caminho.absolute().as_posix(), args)
+        em_cache = _ARTEFATO_CACHE.get(chave)
+        if em_cache is not None and em_cache[0] == assinatura:
+            return em_cache[1]
+        valor = leitor(caminho, *args)
+        _ARTEFATO_CACHE[chave] = (assinatura, valor)
+        return valor
+    return envoltorio
+
+@_memoizar_por_mtime
+def _carregar_meta(caminho: Path) -> dict:
+    """Apenas as chaves de _CHAVES_META de 'melhor_modelo.json'."""
+    if IJSON_DISPONIVEL:
+        # Percorre o objeto raiz chave a chave, sem montar a árvore inteira
+        with open(caminho, "rb") as f:
+            return {k: v for k, v in ijson.kvitems(f, "", use_float=True) if k in _CHAVES_META}
+    return {k: v for k, v in _json_loads(caminho.read_bytes()).items() if k in _CHAVES_META}
+
+@_memoizar_por_mtime
+def _carregar_texto(caminho: Path) -> str:
+    return caminho.read_text(encoding="utf-8")
+
+# Os CSVs abaixo vão para o prompt como texto (o LLM lê CSV sem problemas):
+# nada de DataFrame + to_string só para reformatar a tabela.
+
+@_memoizar_por_mtime
+def _carregar_linhas_iniciais(caminho: Path, n_linhas: int) -> str:
+    with open(caminho, encoding="utf-8-sig") as f:
+        return "".join(itertools.islice(f, n_linhas))
+
+@_memoizar_por_mtime
+def _carregar_csv_colunas(caminho: Path, colunas: frozenset) -> str:
+    """Texto do CSV apenas com as colunas em `colunas` (ordem do arquivo)."""
+    with open(caminho, newline="", encoding="utf-8-sig") as f:
+        linhas = list(csv.reader(f))
+    if not linhas:
+        return ""
+    manter = [i for i, nome in enumerate(linhas[0]) if nome in colunas]
+    saida = io.StringIO()
+    csv.writer(saida, lineterminator="\n").writerows(
+        [linha[i] for i in manter] for linha in linhas
+    )
+    return saida.getvalue()
+
+@_memoizar_por_mtime
+def _recortar_correlacoes(caminho: Path, principais: tuple) -> str:
+    """
+    Submatriz `principais` x `principais`, lida linha a linha: só as k x k
+    células usadas são convertidas (memória O(k²), não O(N²) da matriz toda).
+    """
+    with open(caminho, newline="", encoding="utf-8-sig") as f:
+        leitor = csv.reader(f)
+        posicao = {nome: i for i, nome in enumerate(next(leitor))}
+        nomes = [c for c in principais if c in posicao][:_MAX_LINHAS_CORRELACOES]
+        if not nomes:
+            raise ValueError("nenhuma variável do modelo está na matriz")
+        colunas = [posicao[c] for c in nomes]
+        rotulo = posicao["variavel"]
+        procurados = set(nomes)
+        linhas = {}
+        for linha in leitor:
+            if linha[rotulo] in procurados:
+                linhas[linha[rotulo]] = [float(linha[i]) if linha[i] else np.nan for i in colunas]
+    # Linha ausente -> KeyError (tratado como falha do filtro)
+    df = pd.DataFrame(np.array([linhas[c] for c in nomes]), columns=nomes)
+    df.insert(0, "variavel", nomes)
+    return df.to_string(index=False)
+
+def _carregar_correlacoes(caminho: Path, principais: tuple) -> str | None:
+    """
+    Matriz pequena: o texto do CSV, inteiro. Matriz grande: só o recorte
+    pelas variáveis do modelo (`principais`).
+    """
+    # Lê no máximo uma linha além do limite (+1: cabeçalho)
+    inicio = _carregar_linhas_iniciais(caminho, _MAX_LINHAS_CORRELACOES + 2)
+    if inicio is None or len(inicio.splitlines()) <= _MAX_LINHAS_CORRELACOES + 1:
+        return inicio
+    return _recortar_correlacoes(caminho, principais)
+
+def _carregar_variaveis(base_path: Path) -> str | None:
+    # O CSV do RF tem prioridade; o do OLS só é usado na sua ausência
+    for nome in _ARQUIVOS_VARIAVEIS:
+        # +1: linha de cabeçalho
+        texto = _carregar_linhas_iniciais(base_path / nome, _MAX_LINHAS_VARIAVEIS + 1)
+        if texto is not None:
+            return texto
+    return None
+
+def _executar_leitura(tarefa):
+    """Valor da tarefa, ou a exceção levantada (não propaga)."""
+    try:
+        return tarefa()
+    except Exception as e:
+        return e
+
+def _sem_erro(resultado, descricao: str):
+    """Devolve o resultado da leitura, ou None (com aviso) se ela falhou ou o arquivo não existe."""
+    if resultado is None:
+        logging.warning("Artefato %s não encontrado.", descricao)
+    elif isinstance(resultado, Exception):
+        logging.warning("Artefato %s: falha na leitura: %s", descricao, resultado)
+        return None
+    return resultado
+
+def _truncar(texto: str, max_linhas: int | None = None, max_caracteres: int | None = None) -> str:
+    """Primeiras `max_linhas` linhas (e até `max_caracteres`), com aviso do corte."""
+    cortado = texto
+    if max_linhas is not None:
+        linhas = texto.splitlines(keepends=True)
+        if len(linhas) > max_linhas:
+            cortado = "".join(linhas[:max_linhas])
+    if max_caracteres is not None and len(cortado) > max_caracteres:
+        # Corta na última quebra de linha antes do limite
+        cortado = cortado[:cortado.rfind("\n", 0, max_caracteres) + 1]
+    if cortado == texto:
+        return texto
+    return cortado.rstrip("\n") + f"\n[... truncado: {len(texto) - len(cortado)} caracteres omitidos]\n"
+
+def _filtrar_composicao(texto: str, alvo: str | None, features: list) -> str:
+    """Mantém só os índices usados no modelo (preditores e o índice alvo)."""
+    if not features:
+        return texto
+    composicao = _json_loads(texto)
+    conjunto_features = set(features)  # pertinência O(1) em vez de varrer a lista
+    usados = {
+        indice: colunas for indice, colunas in composicao.items()
+        if indice in conjunto_features or (alvo or "").startswith(indice)
+    }
+    if len(usados) == len(composicao):
+        return texto  # nada a remover: o texto original já está formatado
+    return _json_dumps(usados)
+
 def _coletar_artefatos() -> dict:
-    artefatos = {}
+    """Coleta os artefatos das Etapas 1-10 (cada arquivo só é relido se mudou)."""
     base_path = Path("resultados")
+    tarefas = {
+        "comparacao": lambda: _carregar_csv_colunas(
+            base_path / "tabelas/comparacao_modelos.csv", _COLUNAS_COMPARACAO
+        ),
+        "variaveis": lambda: _carregar_variaveis(base_path),
+        "recomendacoes": lambda: _carregar_texto(
+            base_path / "textos/recomendacoes_politicas_publicas.txt"
+        ),
+        # Já está salvo com indent=2/ensure_ascii=False: vai para o prompt sem parse
+        "composicao": lambda: _carregar_texto(base_path / "tabelas/composicao_indices.json"),
+    }
+    # Leituras independentes em paralelo (cada uma bloqueia em E/S e libera
+    # o GIL); os metadados são lidos nesta thread enquanto as demais correm,
+    # e só então sai a leitura das correlações, que depende deles.
+    with ThreadPoolExecutor(max_workers=len(tarefas) + 1) as executor:
+        futuros = {nome: executor.submit(_executar_leitura, t) for nome, t in tarefas.items()}
+        meta = _executar_leitura(lambda: _carregar_meta(base_path / "tabelas/melhor_modelo.json"))
+        meta = _sem_erro(meta, "'melhor_modelo.json'")
+        principais = () if meta is None else (
+            (meta.get('alvo'),) + tuple(meta.get('features', []))
+        )
+        futuros["correlacoes"] = executor.submit(
+            _executar_leitura,
+            lambda: _carregar_correlacoes(base_path / "tabelas/correlacoes.csv", principais)
+        )
+    lidos = {nome: futuro.result() for nome, futuro in futuros.items()}
+    artefatos = {}
 
     # 1. Metadados do Modelo
-    try:
-        with open(base_path / "tabelas/melhor_modelo.json", "r", encoding="utf-8") as f:
-            meta = json.load(f)
-            artefatos['melhor_modelo_meta'] = meta
-            artefatos['alvo'] = meta.get('alvo')
-            artefatos['alvo_media'] = meta.get('alvo_media')
-            artefatos['alvo_n_validos'] = meta.get('alvo_n_validos')
-    except Exception as e:
-        logging.warning(f"Artefato 'melhor_modelo.json' não encontrado: {e}")
-        artefatos['melhor_modelo_meta'] = {"erro": str(e)}
+    if meta is None:
+        artefatos['melhor_modelo_meta'] = {"erro": "'melhor_modelo.json' não encontrado ou ilegível"}
+    else:
+        artefatos['melhor_modelo_meta'] = meta
+        artefatos['alvo'] = meta.get('alvo')
+        artefatos['alvo_media'] = meta.get('alvo_media')
+        artefatos['alvo_n_validos'] = meta.get('alvo_n_validos')
 
     # 2. Comparação de Todos os Modelos
-    try:
-        artefatos['comparacao_modelos_csv'] = pd.read_csv(
-            base_path / "tabelas/comparacao_modelos.csv"
-        ).to_string(index=False)
-    except Exception as e:
-        logging.warning(f"Artefato 'comparacao_modelos.csv' não encontrado: {e}")
+    comparacao = _sem_erro(lidos["comparacao"], "'comparacao_modelos.csv'")
+    if comparacao is not None:
+        artefatos['comparacao_modelos_csv'] = comparacao
 
     # 3. Variáveis Relevantes
-    try:
-        p_rf = base_path / "tabelas/variaveis_importancia_rf.csv"
-        p_ols = base_path / "tabelas/variaveis_significativas_ols.csv"
-        if p_rf.exists():
-            artefatos['variaveis_relevantes_csv'] = pd.read_csv(p_rf).to_string(index=False)
-        elif p_ols.exists():
-            artefatos['variaveis_relevantes_csv'] = pd.read_csv(p_ols).to_string(index=False)
-        else:
-            raise FileNotFoundError("Nenhum CSV de variáveis relevantes/importantes encontrado.")
-    except Exception as e:
-        logging.warning(f"Artefato de variáveis relevantes não encontrado: {e}")
+    variaveis = _sem_erro(lidos["variaveis"], "de variáveis relevantes (RF ou OLS)")
+    if variaveis is not None:
+        artefatos['variaveis_relevantes_csv'] = variaveis
 
     # 4. Recomendações brutas
-    try:
-        artefatos['recomendacoes_txt'] = (
-            base_path / "textos/recomendacoes_politicas_publicas.txt"
-        ).read_text(encoding="utf-8")
-    except Exception as e:
-        logging.warning(f"Artefato 'recomendacoes_politicas_publicas.txt' não encontrado: {e}")
+    recomendacoes = _sem_erro(lidos["recomendacoes"], "'recomendacoes_politicas_publicas.txt'")
+    if recomendacoes is not None:
+        artefatos['recomendacoes_txt'] = recomendacoes
 
-    # 5. Matriz de Correlação
-    try:
-        df_corr = pd.read_csv(base_path / "tabelas/correlacoes.csv")
-        if len(df_corr) > 15:
-            principais = [artefatos['alvo']] + artefatos['melhor_modelo_meta'].get('features', [])
-            principais = [c for c in principais if c in df_corr.columns][:15]
-            df_corr = df_corr.set_index('variavel').loc[principais, principais].reset_index()
-        artefatos['correlacoes_csv'] = df_corr.to_string(index=False)
-    except Exception as e:
-        logging.warning(f"Artefato 'correlacoes.csv' não encontrado ou falha ao filtrar: {e}")
+    # 5. Matriz de Correlação (as grandes já vêm recortadas pelas variáveis do modelo)
+    correlacoes = _sem_erro(lidos["correlacoes"], "'correlacoes.csv'")
+    if correlacoes is not None:
+        artefatos['correlacoes_csv'] = correlacoes
 
     # 6. Composição dos Índices
-    try:
-        caminho_composicao = base_path / "tabelas/composicao_indices.json"
-        with open(caminho_composicao, "r", encoding="utf-8") as f:
-            artefatos['composicao_indices'] = json.load(f)
-    except Exception as e:
-        logging.warning(f"Artefato 'composicao_indices.json' não encontrado: {e}")
+    composicao = _sem_erro(lidos["composicao"], "'composicao_indices.json'")
+    if composicao is not None:
+        try:
+            artefatos['composicao_indices_raw'] = _filtrar_composicao(
+                composicao, artefatos.get('alvo'), artefatos['melhor_modelo_meta'].get('features', [])
+            )
+        except Exception as e:
+            logging.warning("Artefato 'composicao_indices.json': falha ao filtrar: %s", e)
+            artefatos['composicao_indices_raw'] = composicao
 
     return artefatos
 
-def _gerar_prompt_sistema() -> str:
-    """Define a persona e a missão do LLM."""
-    return """
+# Persona e missão do LLM (constante: montada uma única vez no import)
+_PROMPT_SISTEMA = """
 Você é um Analista de Dados Educacionais Sênior, especializado em interpretar
 modelos estatísticos (como OLS e Random Forest) e dados da pesquisa PISA.
 
@@ -146,81 +360,181 @@ Liste-as em ordem e explique o que elas significam.)
 (Quais foram as limitações (ex: R² moderado, dados faltantes)?)
 """
 
+def _gerar_prompt_sistema() -> str:
+    """Define a persona e a missão do LLM."""
+    return _PROMPT_SISTEMA
+
 def _gerar_prompt_usuario(artefatos: dict) -> str:
     """Formata todos os artefatos em um único prompt de usuário."""
     
-    prompt_parts = [
-        "Por favor, gere o relatório executivo com base nos seguintes artefatos:",
-        "\n--- INÍCIO DOS ARTEFATOS ---\n"
-    ]
+    # Cada seção é escrita direto no buffer (sem strings intermediárias)
+    buf = io.StringIO()
+    buf.write("Por favor, gere o relatório executivo com base nos seguintes artefatos:\n")
+    buf.write("\n--- INÍCIO DOS ARTEFATOS ---\n")
 
     # 1. Contexto (do JSON)
     meta = artefatos.get('melhor_modelo_meta', {})
     contexto_original = meta.get('contexto', {})
     if contexto_original:
-        prompt_parts.append("== CONTEXTO DO ESTUDO ==\n" + json.dumps(contexto_original, indent=2, ensure_ascii=False))
+        buf.write("\n== CONTEXTO DO ESTUDO ==\n")
+        buf.write(_json_dumps(contexto_original))
 
     # 2. Desempenho do Modelo Vencedor (do JSON)
-    prompt_parts.append("\n== DESEMPENHO DO MODELO VENCEDOR ==\n" +
-                        f"Modelo Vencedor: {meta.get('melhor_modelo')}\n" +
-                        f"Variável Alvo (Y): {meta.get('alvo')}\n" +
-                        f"Preditores (X) Utilizados: {meta.get('features')}\n"
-    )
+    buf.write("\n\n== DESEMPENHO DO MODELO VENCEDOR ==\n")
+    buf.write(f"Modelo Vencedor: {meta.get('melhor_modelo')}\n")
+    buf.write(f"Variável Alvo (Y): {meta.get('alvo')}\n")
+    buf.write(f"Preditores (X) Utilizados: {meta.get('features')}\n")
     if artefatos.get('alvo_media'):
-        prompt_parts.append(
-            f"Média da Variável Alvo ({meta.get('alvo')}): {artefatos['alvo_media']:.4f}\n" +
-            f"(N Válido: {artefatos.get('alvo_n_validos')})\n"
-        )
+        buf.write(f"\nMédia da Variável Alvo ({meta.get('alvo')}): {artefatos['alvo_media']:.4f}\n")
+        buf.write(f"(N Válido: {artefatos.get('alvo_n_validos')})\n")
 
     # 3. Comparação de Todos os Modelos (CSV)
     if artefatos.get('comparacao_modelos_csv'):
-        prompt_parts.append("\n== DESEMPENHO DE TODOS OS MODELOS (R² E MÉTRICAS) ==\n" +
-                            artefatos['comparacao_modelos_csv'])
+        buf.write("\n\n== DESEMPENHO DE TODOS OS MODELOS (R² E MÉTRICAS) ==\n")
+        # +1: linha de cabeçalho
+        buf.write(_truncar(artefatos['comparacao_modelos_csv'], max_linhas=_MAX_LINHAS_COMPARACAO + 1))
 
     # 4. Variáveis Relevantes (CSV da Etapa 9)
     if artefatos.get('variaveis_relevantes_csv'):
-        prompt_parts.append("\n== PRINCIPAIS VARIÁVEIS (POR IMPORTÂNCIA OU P-VALOR) ==\n" +
-                            artefatos['variaveis_relevantes_csv'])
+        buf.write("\n\n== PRINCIPAIS VARIÁVEIS (POR IMPORTÂNCIA OU P-VALOR) ==\n")
+        buf.write(artefatos['variaveis_relevantes_csv'])
     
     # 5. Composição dos Índices (JSON da Etapa 5)
-    if artefatos.get('composicao_indices'):
-        prompt_parts.append("\n== COMPOSIÇÃO DOS ÍNDICES (A 'RECEITA') ==\n" +
-                            "(Mapeamento de 'Índice Gerado' -> ['Colunas PISA Originais'])\n" +
-                            json.dumps(artefatos['composicao_indices'], indent=2, ensure_ascii=False))
+    if artefatos.get('composicao_indices_raw'):
+        buf.write("\n\n== COMPOSIÇÃO DOS ÍNDICES (A 'RECEITA') ==\n")
+        buf.write("(Mapeamento de 'Índice Gerado' -> ['Colunas PISA Originais'])\n")
+        buf.write(artefatos['composicao_indices_raw'])
 
     # 6. Recomendações Preliminares (TXT da Etapa 10)
     if artefatos.get('recomendacoes_txt'):
-        prompt_parts.append("\n== RECOMENDAÇÕES PRELIMINARES (DA ETAPA 10) ==\n" +
-                            artefatos['recomendacoes_txt'])
+        buf.write("\n\n== RECOMENDAÇÕES PRELIMINARES (DA ETAPA 10) ==\n")
+        buf.write(artefatos['recomendacoes_txt'])
 
     # 7. Correlações (CSV)
     if artefatos.get('correlacoes_csv'):
-        prompt_parts.append("\n== MATRIZ DE CORRELAÇÃO (AMOSTRA) ==\n" +
-                            artefatos['correlacoes_csv'])
+        buf.write("\n\n== MATRIZ DE CORRELAÇÃO (AMOSTRA) ==\n")
+        buf.write(_truncar(artefatos['correlacoes_csv'], max_caracteres=_MAX_CARACTERES_CORRELACOES))
 
-    prompt_parts.append("\n--- FIM DOS ARTEFATOS ---")
+    buf.write("\n\n--- FIM DOS ARTEFATOS ---")
     
-    return "\n".join(prompt_parts)
+    return buf.getvalue()
+
+
+# ============================================================
+# CACHE DE RESPOSTAS DO LLM (SQLite)
+# ------------------------------------------------------------
+# Chave exata: sha256(provedor | modelo | prompt do sistema | prompt
+# do usuário). Mesmos artefatos + mesma configuração => mesma resposta,
+# sem nova chamada (paga e lenta) à API. LLM_CACHE=0 no ambiente (ou
+# --llm-no-cache no main.py) desliga consulta e gravação.
+# ============================================================
+
+CAMINHO_CACHE_LLM = Path("resultados/.llm_cache.sqlite")
+
+def _cache_chave(provedor: str, modelo: str, system_prompt: str, user_prompt: str) -> str:
+    conteudo = f"{provedor}|{modelo}|{system_prompt}|{user_prompt}"
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+# Arquivos (relativos a 'resultados/') cujo conteúdo identifica uma execução
+_ARQUIVOS_ARTEFATOS = (
+    "tabelas/melhor_modelo.json",
+    "tabelas/comparacao_modelos.csv",
+    *_ARQUIVOS_VARIAVEIS,
+    "textos/recomendacoes_politicas_publicas.txt",
+    "tabelas/correlacoes.csv",
+    "tabelas/composicao_indices.json",
+)
+
+@_memoizar_por_mtime
+def _hash_arquivo(caminho: Path) -> bytes:
+    return hashlib.sha256(caminho.read_bytes()).digest()
+
+def _hash_artefatos() -> str:
+    """sha256 do conteúdo de todos os artefatos (um ausente conta como vazio)."""
+    h = hashlib.sha256()
+    for nome in _ARQUIVOS_ARTEFATOS:
+        h.update(nome.encode("utf-8"))
+        h.update(_hash_arquivo(Path("resultados") / nome) or b"")
+    return h.hexdigest()
+
+def _cache_habilitado() -> bool:
+    return os.environ.get("LLM_CACHE", "").lower() not in ("0", "false")
+
+def _cache_conectar() -> sqlite3.Connection:
+    CAMINHO_CACHE_LLM.parent.mkdir(parents=True, exist_ok=True)
+    conexao = sqlite3.connect(CAMINHO_CACHE_LLM)
+    conexao.execute(
+        "CREATE TABLE IF NOT EXISTS respostas ("
+        " sha256 TEXT PRIMARY KEY, prompt TEXT, response TEXT, model TEXT, ts TEXT)"
+    )
+    return conexao
+
+def _cache_consultar(chave: str) -> str | None:
+    if not _cache_habilitado():
+        return None
+    try:
+        with closing(_cache_conectar()) as conexao, conexao:
+            linha = conexao.execute(
+                "SELECT response FROM respostas WHERE sha256 = ?", (chave,)
+            ).fetchone()
+        return linha[0] if linha else None
+    except sqlite3.Error as e:
+        logging.warning(f"Cache do LLM indisponível: {e}")
+        return None
+
+def _cache_gravar(chave: str, prompt: str, resposta: str, modelo: str):
+    if not _cache_habilitado():
+        return
+    try:
+        with closing(_cache_conectar()) as conexao, conexao:
+            conexao.execute(
+                "INSERT OR REPLACE INTO respostas VALUES (?, ?, ?, ?, ?)",
+                (chave, prompt, resposta, modelo, time.strftime("%Y-%m-%dT%H:%M:%S"))
+            )
+    except sqlite3.Error as e:
+        logging.warning(f"Falha ao gravar no cache do LLM: {e}")
 
 
 # ============================================================
 # FUNÇÕES DE EXECUÇÃO: LLM
 # ============================================================
 
+@functools.lru_cache(maxsize=1)
+def _cliente_groq(api_key: str):
+    """Cliente Groq reutilizado entre chamadas (mantém o pool de conexões HTTP)."""
+    from groq import Groq
+    return Groq(api_key=api_key)
+
+@functools.lru_cache(maxsize=4)
+def _cliente_google(api_key: str, model_name: str):
+    """GenerativeModel do Google, configurado uma vez por chave/modelo."""
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model_name)
+
+
 def _selecionar_provedor_modelo(provider: str | None, model: str | None) -> tuple:
     """
     Seleciona o cliente da API (Groq ou Google) e o nome do modelo.
-    (Nomes padrão corrigidos para 'gemini-2.5-flash' e 'llama-3.3-70b-versatile')
+    Retorna (cliente, tipo_provedor, model_name), com o padrão já aplicado.
     """
-    
-    groq_api_key = os.environ.get("GROQ_API_KEY")
-    google_api_key = os.environ.get("GOOGLE_API_KEY")
+    # As chaves entram na chave do cache: trocar a chave no ambiente
+    # (ex.: .env recarregado) leva a uma nova seleção
+    return _resolver_provedor_modelo(
+        provider, model, os.environ.get("GROQ_API_KEY"), os.environ.get("GOOGLE_API_KEY")
+    )
 
+@functools.lru_cache(maxsize=4)
+def _resolver_provedor_modelo(provider: str | None, model: str | None,
+                              groq_api_key: str | None, google_api_key: str | None) -> tuple:
+    """
+    Seleção memoizada por processo: novas chamadas com a mesma configuração
+    reaproveitam o cliente (e suas conexões) sem reconfigurar nem relogar.
+    (Nomes padrão corrigidos para 'gemini-2.5-flash' e 'llama-3.3-70b-versatile')
+    """
     # Configuração do Google
     if google_api_key and (provider == "google" or (provider in [None, "auto"] and not groq_api_key)):
         try:
-            genai.configure(api_key=google_api_key)
-            
             # ########################################################
             # # ### INÍCIO DA MODIFICAÇÃO (Nome do Modelo) ###
             # ########################################################
@@ -229,9 +543,9 @@ def _selecionar_provedor_modelo(provider: str | None, model: str | None) -> tupl
             # # ### FIM DA MODIFICAÇÃO ###
             # ########################################################
             
-            cliente = genai.GenerativeModel(model_name)
+            cliente = _cliente_google(google_api_key, model_name)
             logging.info(f"Usando Provedor: Google (Modelo: {model_name})")
-            return cliente, "google"
+            return cliente, "google", model_name
         except Exception as e:
             logging.error(f"Falha ao configurar Google Gemini: {e}")
             if not groq_api_key:
@@ -240,7 +554,7 @@ def _selecionar_provedor_modelo(provider: str | None, model: str | None) -> tupl
     # Configuração do Groq
     if groq_api_key:
         try:
-            cliente = Groq(api_key=groq_api_key)
+            cliente = _cliente_groq(groq_api_key)
             
             # ########################################################
             # # ### INÍCIO DA MODIFICAÇÃO (Nome do Modelo) ###
@@ -251,7 +565,7 @@ def _selecionar_provedor_modelo(provider: str | None, model: str | None) -> tupl
             # ########################################################
 
             logging.info(f"Usando Provedor: Groq (Modelo: {model_name})")
-            return cliente, "groq"
+            return cliente, "groq", model_name
         except Exception as e:
             logging.error(f"Falha ao configurar Groq: {e}")
             raise ConnectionError("Falha ao inicializar a API do Groq.")
@@ -259,23 +573,86 @@ def _selecionar_provedor_modelo(provider: str | None, model: str | None) -> tupl
     raise ConnectionError("Nenhuma chave de API (GROQ_API_KEY ou GOOGLE_API_KEY) foi encontrada nas variáveis de ambiente.")
 
 
-def _executar_geracao(cliente, tipo_provedor: str, system_prompt: str, user_prompt: str, model_name: str | None) -> str:
+class _ControleFluxo:
+    """
+    Sinais de uma geração disputada em _gerar_em_corrida: avisa quando chega
+    o primeiro pedaço e permite interromper a resposta perdedora.
     """
-    Executa a chamada à API (Groq ou Google) e retorna a resposta em texto.
+    def __init__(self):
+        self.primeiro_pedaco = threading.Event()
+        self.cancelado = threading.Event()
+        self.fonte = None  # objeto de streaming do SDK (fechado ao cancelar)
+
+    def cancelar(self):
+        self.cancelado.set()
+        # Fechar o stream do SDK (Groq) derruba a conexão mesmo com a thread
+        # bloqueada à espera do próximo pedaço; sem close(), ela para no
+        # próximo pedaço que chegar
+        fechar = getattr(self.fonte, "close", None)
+        if fechar:
+            try:
+                fechar()
+            except Exception:
+                pass
+
+
+def _consumir_fluxo(pedacos, destino: Path | None = None, controle: _ControleFluxo | None = None) -> str:
+    """
+    Junta os pedaços de uma resposta em streaming. Com `destino`, cada pedaço
+    é gravado assim que chega: se a conexão cair no meio, o texto parcial
+    fica preservado em disco. O arquivo é descarregado a cada quebra de
+    linha, então o relatório pode ser acompanhado (ex.: tail -f) enquanto
+    a resposta chega.
+    """
+    partes = []
+    arquivo = open(destino, "w", encoding="utf-8", buffering=1) if destino else None
+    try:
+        for pedaco in pedacos:
+            if controle:
+                if controle.cancelado.is_set():
+                    break
+                controle.primeiro_pedaco.set()
+            if pedaco:
+                partes.append(pedaco)
+                if arquivo:
+                    arquivo.write(pedaco)
+    finally:
+        if arquivo:
+            arquivo.close()
+    return "".join(partes)
+
+
+def _texto_pedaco_google(pedaco) -> str:
+    """
+    Texto de um pedaço do streaming do Gemini, lido pelas 'parts' do
+    candidato: o atalho `.text` levanta ValueError em pedaços sem parts
+    (ex.: o último, só com finish_reason), o que derrubaria o relatório.
+    """
+    candidatos = pedaco.candidates
+    if not candidatos:
+        return ""
+    return "".join(p.text for p in candidatos[0].content.parts)
+
+
+def _registrar_fonte(controle: _ControleFluxo | None, fonte):
+    if controle:
+        controle.fonte = fonte
+        if controle.cancelado.is_set():  # cancelado antes de o stream existir
+            controle.cancelar()
+
+
+def _executar_geracao(cliente, tipo_provedor: str, system_prompt: str, user_prompt: str, model_name: str,
+                      destino: Path | None = None, controle: _ControleFluxo | None = None) -> str:
+    """
+    Executa a chamada à API (Groq ou Google) em streaming e retorna a resposta em texto.
+    Se `destino` for informado, a resposta é gravada nele à medida que chega.
+    `controle` é usado apenas no modo corrida (ver _gerar_em_corrida).
     (Usa a sintaxe antiga do Google para compatibilidade)
     """
     try:
         if tipo_provedor == "groq":
-            # ########################################################
-            # # ### INÍCIO DA MODIFICAÇÃO (Nome do Modelo) ###
-            # ########################################################
-            # Garante que o modelo padrão aqui seja o mesmo definido acima
-            model_name = model_name if model_name else "llama-3.3-70b-versatile" # <-- CORRIGIDO
-            # ########################################################
-            # # ### FIM DA MODIFICAÇÃO ###
-            # ########################################################
-            
-            chat_completion = cliente.chat.completions.create(
+            # model_name já vem resolvido por _selecionar_provedor_modelo
+            fluxo = cliente.chat.completions.create(
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt},
@@ -283,8 +660,12 @@ def _executar_geracao(cliente, tipo_provedor: str, system_prompt: str, user_prom
                 model=model_name,
                 temperature=0.3,
                 max_tokens=4096, # Llama 3.3 tem 8k, mas 4k é seguro para a resposta
+                stream=True,
+            )
+            _registrar_fonte(controle, fluxo)
+            return _consumir_fluxo(
+                (c.choices[0].delta.content for c in fluxo if c.choices), destino, controle
             )
-            return chat_completion.choices[0].message.content
         
         elif tipo_provedor == "google":
             # Usando a sintaxe de compatibilidade (generate_content)
@@ -295,27 +676,95 @@ def _executar_geracao(cliente, tipo_provedor: str, system_prompt: str, user_prom
                 "---", # Separador
                 user_prompt
             ]
-            response = cliente.generate_content(prompt_combinado)
-            return response.text
+            response = cliente.generate_content(prompt_combinado, stream=True)
+            _registrar_fonte(controle, response)
+            return _consumir_fluxo((_texto_pedaco_google(c) for c in response), destino, controle)
         
         else:
             raise ValueError(f"Tipo de provedor desconhecido: {tipo_provedor}")
 
     except Exception as e:
-        logging.error(f"Erro durante a chamada da API do LLM ({tipo_provedor}): {e}", exc_info=True)
+        if controle and controle.cancelado.is_set():
+            # Perdeu a corrida e teve o stream fechado: não é um erro
+            return "Erro ao gerar relatório: geração cancelada (outro provedor respondeu antes)"
+        # Erro de API (chave, cota, rede) é esperado: sem traceback no log, o
+        # diagnóstico vai na mensagem e no texto de erro retornado
+        logging.error("Erro durante a chamada da API do LLM (%s): %s", tipo_provedor, e)
         if hasattr(e, 'response'):
             try:
                 erro_api = e.response.json()
-                logging.error(f"Detalhes do erro da API: {erro_api}")
+                logging.error("Detalhes do erro da API: %s", erro_api)
                 return f"Erro ao gerar relatório: {erro_api}"
             except Exception:
                 return f"Erro ao gerar relatório: {str(e)}"
         return f"Erro ao gerar relatório: {str(e)}"
 
 
+def _resposta_valida(texto: str | None) -> bool:
+    """Resposta utilizável: não vazia, não curta e não uma mensagem de erro."""
+    return bool(texto) and len(texto) >= 100 and not texto.startswith("Erro ao gerar relatório")
+
+
+def _gerar_em_corrida(system_prompt: str, user_prompt: str, atraso_hedge: float = 1.0) -> tuple:
+    """
+    Modo 'auto' com as duas chaves configuradas: dispara o Groq e, se nenhum
+    pedaço da resposta chegar em `atraso_hedge` segundos (ou se ele falhar),
+    dispara também o Google. O prazo vale para o primeiro pedaço, não para a
+    resposta inteira: com o Groq já transmitindo, o Google não é chamado.
+    Vale a primeira resposta válida; o stream da perdedora é fechado.
+    Retorna (texto, tipo_provedor).
+    """
+    fila = []
+    for nome in ("groq", "google"):
+        cliente, tipo_provedor, model_name = _selecionar_provedor_modelo(nome, None)
+        if tipo_provedor == nome:
+            fila.append((cliente, tipo_provedor, model_name))
+
+    executor = ThreadPoolExecutor(max_workers=len(fila) or 1)
+    pendentes = {}  # futuro -> (tipo_provedor, controle)
+    erros = []
+
+    def disparar():
+        cliente, tipo_provedor, model_name = fila.pop(0)
+        controle = _ControleFluxo()
+        futuro = executor.submit(
+            _executar_geracao, cliente, tipo_provedor, system_prompt, user_prompt, model_name,
+            controle=controle
+        )
+        pendentes[futuro] = (tipo_provedor, controle)
+        return time.monotonic()
+
+    try:
+        disparado_em = disparar()
+        while fila or pendentes:
+            if fila:
+                sem_resposta = not any(c.primeiro_pedaco.is_set() for _, c in pendentes.values())
+                if not pendentes or (sem_resposta and time.monotonic() - disparado_em >= atraso_hedge):
+                    disparado_em = disparar()
+
+            concluidos, _ = wait(
+                pendentes, timeout=0.05 if fila else None, return_when=FIRST_COMPLETED
+            )
+            for futuro in concluidos:
+                tipo_provedor, _ = pendentes.pop(futuro)
+                try:
+                    texto = futuro.result()
+                except Exception as e:
+                    texto = f"Erro ao gerar relatório: {e}"
+                if _resposta_valida(texto):
+                    return texto, tipo_provedor
+                erros.append(f"{tipo_provedor}: {str(texto)[:200]}")
+    finally:
+        # Interrompe a perdedora (fecha o stream) e não espera por ela
+        for _, controle in pendentes.values():
+            controle.cancelar()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    raise RuntimeError(f"Nenhum provedor gerou resposta válida ({' | '.join(erros)})")
+
+
 # ============================================================
 # FUNÇÃO PRINCIPAL: PONTO DE ENTRADA
-# (Esta seção inteira não foi alterada)
 # ============================================================
 
 def gerar_relatorio_automatico(provider: str | None = None, model: str | None = None):
@@ -324,44 +773,102 @@ def gerar_relatorio_automatico(provider: str | None = None, model: str | None =
     
     base_path = Path("resultados/textos_llm")
     base_path.mkdir(parents=True, exist_ok=True)
+    gravacao_prompt = None
     
     try:
-        # 1. Coleta de dados
+        caminho_relatorio = base_path / "relatorio_final_llm.md"
+        # Recebe o texto durante o streaming; só substitui o relatório final
+        # se a resposta for válida (em caso de falha, o parcial fica em disco)
+        caminho_parcial = base_path / "relatorio_final_llm.parcial.md"
+
+        # 1. Seleção do Provedor (antes do cache: as chaves usam o provedor e
+        #    o modelo efetivos, não os rótulos 'auto'/padrão, para que trocar
+        #    de chave de API no ambiente não devolva a resposta de outro LLM)
+        corrida = (
+            provider == "auto" and not model
+            and GROQ_DISPONIVEL and GOOGLE_DISPONIVEL
+            and os.environ.get("GROQ_API_KEY") and os.environ.get("GOOGLE_API_KEY")
+        )
+        if corrida:
+            tipo_provedor, model_name = "corrida", "groq+google"
+        else:
+            logging.info(f"({etapa}) - Selecionando provedor de LLM...")
+            cliente, tipo_provedor, model_name = _selecionar_provedor_modelo(provider, model)
+
+        # 2. Atalho: artefatos idênticos (byte a byte) aos de uma execução já
+        #    respondida -> nem coleta, nem monta os prompts, nem chama a API
+        chave_artefatos = _cache_chave(
+            tipo_provedor, model_name, _PROMPT_SISTEMA, f"artefatos:{_hash_artefatos()}"
+        )
+        relatorio_cache = _cache_consultar(chave_artefatos)
+        if relatorio_cache:
+            caminho_relatorio.write_text(relatorio_cache, encoding="utf-8")
+            logging.info(f"({etapa}) - Relatório reaproveitado do cache (artefatos idênticos): '{caminho_relatorio}'")
+            return relatorio_cache
+
+        # 3. Coleta de dados
         logging.info(f"({etapa}) - Coletando artefatos das Etapas 1-10...")
         artefatos = _coletar_artefatos()
         if not artefatos.get('melhor_modelo_meta'):
             raise FileNotFoundError("Artefatos essenciais (melhor_modelo.json) não encontrados.")
 
-        # 2. Seleção do Provedor
-        logging.info(f"({etapa}) - Selecionando provedor de LLM...")
-        cliente, tipo_provedor = _selecionar_provedor_modelo(provider, model)
-        
-        # 3. Geração dos Prompts
+        # 4. Geração dos Prompts
         logging.info(f"({etapa}) - Gerando prompts (sistema e usuário)...")
         system_prompt = _gerar_prompt_sistema()
         user_prompt = _gerar_prompt_usuario(artefatos)
         
-        (base_path / f"prompt_usuario_{datetime.now():%Y%m%d_%H%M%S}.txt").write_text(
-            user_prompt, encoding="utf-8"
-        )
+        # Cópia do prompt para auditoria, só com LLM_LOG_PROMPT=1 no ambiente.
+        # A gravação roda em segundo plano para não atrasar a chamada ao LLM
+        # e é aguardada (join) antes de a função retornar, para não truncar.
+        if os.environ.get("LLM_LOG_PROMPT", "").lower() not in ("", "0", "false"):
+            caminho_prompt = base_path / f"prompt_usuario_{time.strftime('%Y%m%d_%H%M%S')}.txt"
+            gravacao_prompt = threading.Thread(
+                target=caminho_prompt.write_text,
+                args=(user_prompt,),
+                kwargs={"encoding": "utf-8"},
+            )
+            gravacao_prompt.start()
+
+        # 5. Cache: mesma configuração e mesmos prompts já respondidos (pega
+        #    também artefatos que só mudaram em campos fora do prompt, como
+        #    a data em 'comparacao_modelos.csv')
+        chave_cache = _cache_chave(tipo_provedor, model_name, system_prompt, user_prompt)
+        relatorio_cache = _cache_consultar(chave_cache)
+        if relatorio_cache:
+            caminho_relatorio.write_text(relatorio_cache, encoding="utf-8")
+            logging.info(f"({etapa}) - Relatório reaproveitado do cache (artefatos inalterados): '{caminho_relatorio}'")
+            _cache_gravar(chave_artefatos, user_prompt, relatorio_cache, model_name)
+            return relatorio_cache
+
+        # 6. Execução
+        if corrida:
+            logging.info(f"({etapa}) - Modo 'auto': disputando Groq e Google (vale a primeira resposta válida)...")
+            relatorio_texto, tipo_provedor = _gerar_em_corrida(system_prompt, user_prompt)
+            logging.info(f"({etapa}) - Resposta obtida via {tipo_provedor.upper()}.")
+        else:
+            logging.info(f"({etapa}) - Executando chamada à API {tipo_provedor.upper()}... (Isso pode levar um momento)")
+            relatorio_texto = _executar_geracao(
+                cliente,
+                tipo_provedor,
+                system_prompt,
+                user_prompt,
+                model_name=model_name,
+                destino=caminho_parcial
+            )
 
-        # 4. Execução
-        logging.info(f"({etapa}) - Executando chamada à API {tipo_provedor.upper()}... (Isso pode levar um momento)")
-        relatorio_texto = _executar_geracao(
-            cliente,
-            tipo_provedor,
-            system_prompt,
-            user_prompt,
-            model_name=model
-        )
+        # 7. Salvamento (só respostas válidas substituem o relatório final;
+        #    erro no meio do streaming deixa o último relatório bom intacto)
+        if not _resposta_valida(relatorio_texto):
+            logging.warning(f"({etapa}) - Resposta do LLM inválida, curta ou vazia: {str(relatorio_texto)[:200]}")
+            raise ValueError("A resposta do LLM foi inválida, muito curta ou vazia.")
 
-        # 5. Salvamento
-        if not relatorio_texto or len(relatorio_texto) < 100:
-             logging.warning(f"({etapa}) - Resposta do LLM foi curta ou vazia: {relatorio_texto}")
-             raise ValueError("A resposta do LLM foi muito curta ou vazia.")
-             
-        caminho_relatorio = base_path / "relatorio_final_llm.md"
-        caminho_relatorio.write_text(relatorio_texto, encoding="utf-8")
+        if corrida:
+            caminho_relatorio.write_text(relatorio_texto, encoding="utf-8")
+        else:
+            # O texto já foi gravado durante o streaming: basta promovê-lo
+            caminho_parcial.replace(caminho_relatorio)
+        for chave in (chave_cache, chave_artefatos):
+            _cache_gravar(chave, user_prompt, relatorio_texto, tipo_provedor if corrida else model_name)
         
         logging.info(f"({etapa}) - Relatório final salvo com sucesso em '{caminho_relatorio}'")
         return relatorio_texto
@@ -371,6 +878,10 @@ def gerar_relatorio_automatico(provider: str | None = None, model: str | None =
         (base_path / "relatorio_ERRO.txt").write_text(f"Falha ao gerar o relatório: {e}", encoding="utf-8")
         return None
 
+    finally:
+        if gravacao_prompt is not None:
+            gravacao_prompt.join()
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO, format="[%(asctime)s] (%(levelname)s) %(message)s")
     print("Executando Etapa 11 em modo de teste...")
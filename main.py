@@ -25,13 +25,6 @@ from etapa08_interpretacao import gerar_graficos
 from etapa09_refinamento import refinar_conhecimento
 from etapa10_recomendacoes import gerar_recomendacoes
 
-# Etapa 11 é opcional: só importamos se existir/configurada corretamente
-try:
-    from etapa11_relatorio_llm import gerar_relatorio_automatico
-    ETAPA11_DISPONIVEL = True
-except Exception:
-    ETAPA11_DISPONIVEL = False
-
 # ===== Configuração de Logs =====
 logging.basicConfig(
     level=logging.INFO,
@@ -64,6 +57,11 @@ def parse_args():
         default=None,
         help="Sobrescreve o modelo do LLM para esta execução (ex.: 'llama-3.3-70b' ou 'gemini-2.5-flash')."
     )
+    parser.add_argument(
+        "--llm-no-cache",
+        action="store_true",
+        help="Ignora o cache de respostas do LLM (resultados/.llm_cache.sqlite) e força nova chamada à API."
+    )
     return parser.parse_args()
 
 # ==========================================================
@@ -79,15 +77,15 @@ def main():
         # ETAPA 1 – ESCOLHA DO CENÁRIO
         # ==================================================
         cenario = escolher_cenario()
-        logging.info(f"ETAPA 1 - Escolha do Cenário - Cenário definido: {cenario}")
-        logging.info(f"PIPELINE GERAL - Cenário selecionado: {cenario})")
+        logging.info("ETAPA 1 - Escolha do Cenário - Cenário definido: %s", cenario)
+        logging.info("PIPELINE GERAL - Cenário selecionado: %s)", cenario)
 
         # ==================================================
         # ETAPA 2 – FORMULAÇÃO DA HIPÓTESE
         # ==================================================
         hipotese = formular_hipotese(cenario)
         logging.info("ETAPA 2 - Formulação da Hipótese - Hipótese e variáveis definidas.")
-        logging.info(f"PIPELINE GERAL - Hipótese definida: {hipotese['descricao']})")
+        logging.info("PIPELINE GERAL - Hipótese definida: %s)", hipotese['descricao'])
 
         # ==================================================
         # ETAPA 3 – COLETA DE DADOS (PISA 2018)
@@ -98,7 +96,10 @@ def main():
         # # ### INÍCIO DA CORREÇÃO ###
         # ########################################################
         # Corrigido: 'questionário' (com acento) -> 'questionario' (sem acento)
-        logging.info(f"PIPELINE GERAL - Coleta concluída: respostas={respostas.shape}, questionario={questionario.shape})")
+        logging.info(
+            "PIPELINE GERAL - Coleta concluída: respostas=%s, questionario=%s)",
+            respostas.shape, questionario.shape
+        )
         # ########################################################
         # # ### FIM DA CORREÇÃO ###
         # ########################################################
@@ -108,7 +109,7 @@ def main():
         # ETAPA 4 – PRÉ-PROCESSAMENTO (LIMPEZA E TRATAMENTO)
         # ==================================================
         respostas = preprocessar_dados(respostas, cenario)
-        logging.info(f"PIPELINE GERAL - Pré-processamento concluído: {len(respostas)} registros válidos.)")
+        logging.info("PIPELINE GERAL - Pré-processamento concluído: %d registros válidos.)", len(respostas))
 
         # ==================================================
         # ETAPA 5 – TRANSFORMAÇÃO DE DADOS
@@ -120,7 +121,7 @@ def main():
         # ETAPA 6 – MINERAÇÃO DE DADOS (PCA + K-MEANS)
         # ==================================================
         respostas, modelo_kmeans = minerar_dados(respostas)
-        logging.info(f"PIPELINE GERAL - Mineração concluída: {len(respostas)} docentes agrupados.)")
+        logging.info("PIPELINE GERAL - Mineração concluída: %d docentes agrupados.)", len(respostas))
 
         # ==================================================
         # ETAPA 7 – DESCOBERTA DE PADRÕES E MODELAGEM (OLS)
@@ -138,7 +139,10 @@ def main():
         # ETAPA 9 – REFINAMENTO DO CONHECIMENTO
         # ==================================================
         variaveis_significativas = refinar_conhecimento(modelo_ols, respostas)
-        logging.info(f"PIPELINE GERAL - Refinamento concluído: {len(variaveis_significativas)} variáveis significativas.)")
+        logging.info(
+            "PIPELINE GERAL - Refinamento concluído: %d variáveis significativas.)",
+            len(variaveis_significativas)
+        )
 
         # ==================================================
         # ETAPA 10 – GERAÇÃO DE RECOMENDAÇÕES (POLÍTICAS PÚBLICAS)
@@ -152,12 +156,22 @@ def main():
         if args.no_llm:
             logging.info("PIPELINE GERAL - Etapa 11 (LLM) ignorada por parâmetro --no-llm.)")
         else:
+            # Etapa 11 é opcional: só importamos quando for usada (evita o custo
+            # de carregar os SDKs de LLM em execuções com --no-llm)
+            try:
+                from etapa11_relatorio_llm import gerar_relatorio_automatico
+                ETAPA11_DISPONIVEL = True
+            except Exception:
+                ETAPA11_DISPONIVEL = False
+
             if not ETAPA11_DISPONIVEL:
                 logging.warning("PIPELINE GERAL - Etapa 11 não disponível (módulo ausente ou não configurado).")
             else:
                 # Se o usuário passou --llm-model, sobrescreve o modelo apenas para esta execução
                 if args.llm_model:
                     os.environ["LLM_MODEL"] = args.llm_model
+                if args.llm_no_cache:
+                    os.environ["LLM_CACHE"] = "0"
 
                 try:
                     relatorio_texto = gerar_relatorio_automatico(
@@ -169,17 +183,17 @@ def main():
                     else:
                         logging.warning("PIPELINE GERAL - Etapa 11 executada, mas o texto retornado está vazio.")
                 except Exception as e_llm:
-                    logging.warning(f"PIPELINE GERAL - Etapa 11 não executada: {str(e_llm)}")
+                    logging.warning("PIPELINE GERAL - Etapa 11 não executada: %s", e_llm)
 
         # ==================================================
         # FINALIZAÇÃO DO PIPELINE
         # ==================================================
         fim = datetime.now()
         duracao = (fim - inicio).total_seconds()
-        logging.info(f"PIPELINE GERAL - Execução finalizada com sucesso em {duracao:.2f} segundos.)")
+        logging.info("PIPELINE GERAL - Execução finalizada com sucesso em %.2f segundos.)", duracao)
 
     except Exception as e:
-        logging.error(f"[ERRO FATAL] Falha na execução do pipeline: {str(e)}", exc_info=True)
+        logging.error("[ERRO FATAL] Falha na execução do pipeline: %s", e, exc_info=True)
 
 
 # ==========================================================